@@ -0,0 +1,46 @@
+import argparse
+import os
+import subprocess
+
+from paddleocr import PaddleOCR
+
+# Export the PaddleOCR models used by util_sl.py to ONNX so they can run on ONNX Runtime.
+parser = argparse.ArgumentParser()
+parser.add_argument('output_dir', nargs='?', default='./onnx_models')
+parser.add_argument('--int8', action='store_true',
+                    help='also write rec_int8.onnx, an INT8 quantized copy of the recognizer')
+args = parser.parse_args()
+
+os.makedirs(args.output_dir, exist_ok=True)
+
+# creating the reader downloads the Paddle inference models if needed
+ocr = PaddleOCR(use_angle_cls=True, lang='en', show_log=False)
+
+models = {'det': ocr.args.det_model_dir,
+          'rec': ocr.args.rec_model_dir,
+          'cls': ocr.args.cls_model_dir}
+
+for name, model_dir in models.items():
+    subprocess.run(['paddle2onnx',
+                    '--model_dir', model_dir,
+                    '--model_filename', 'inference.pdmodel',
+                    '--params_filename', 'inference.pdiparams',
+                    '--save_file', os.path.join(args.output_dir, '{}.onnx'.format(name)),
+                    '--opset_version', '11',
+                    '--enable_onnx_checker', 'True'],
+                   check=True)
+
+if args.int8:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # paddle2onnx 1.x stores the weights as Constant nodes, which the quantizer does
+    # not accept; the pre-processing pass turns them into initializers
+    rec_pre = os.path.join(args.output_dir, 'rec_pre.onnx')
+    quant_pre_process(os.path.join(args.output_dir, 'rec.onnx'), rec_pre, skip_symbolic_shape=True)
+
+    # weights are stored as INT8 and activations are quantized on the fly
+    quantize_dynamic(rec_pre,
+                     os.path.join(args.output_dir, 'rec_int8.onnx'),
+                     weight_type=QuantType.QInt8)
+    os.remove(rec_pre)
@@ -1,69 +1,152 @@
+import multiprocessing
+import queue
+
 from ultralytics import YOLO
 import cv2
 
 import util_sl
 from sort.sort import *
-from util_sl import get_car, read_license_plate, write_csv
-
-
-results = {}
-
-mot_tracker = Sort()
-
-# load models
-coco_model = YOLO('yolov11n.pt')
-license_plate_detector = YOLO('detection_model.pt')
-
-# load video
-cap = cv2.VideoCapture('./sample.mp4')
-
-vehicles = [2, 3, 5, 7]
-
-# read frames
-frame_nmr = -1
-ret = True
-while ret:
-    frame_nmr += 1
-    ret, frame = cap.read()
-    if ret:
-        results[frame_nmr] = {}
-        # detect vehicles
-        detections = coco_model(frame)[0]
-        detections_ = []
-        for detection in detections.boxes.data.tolist():
-            x1, y1, x2, y2, score, class_id = detection
-            if int(class_id) in vehicles:
-                detections_.append([x1, y1, x2, y2, score])
-
-        # track vehicles
-        track_ids = mot_tracker.update(np.asarray(detections_))
-
-        # detect license plates
-        license_plates = license_plate_detector(frame)[0]
-        for license_plate in license_plates.boxes.data.tolist():
-            x1, y1, x2, y2, score, class_id = license_plate
-
-            # assign license plate to car
-            xcar1, ycar1, xcar2, ycar2, car_id = get_car(license_plate, track_ids)
-
-            if car_id != -1:
-
-                # crop license plate
-                license_plate_crop = frame[int(y1):int(y2), int(x1): int(x2), :]
-
-                # process license plate
-                license_plate_crop_gray = cv2.cvtColor(license_plate_crop, cv2.COLOR_BGR2GRAY)
-                _, license_plate_crop_thresh = cv2.threshold(license_plate_crop_gray, 64, 255, cv2.THRESH_BINARY_INV)
-
-                # read license plate number
-                license_plate_text, license_plate_text_score = read_license_plate(license_plate_crop_thresh)
-
-                if license_plate_text is not None:
-                    results[frame_nmr][car_id] = {'car': {'bbox': [xcar1, ycar1, xcar2, ycar2]},
-                                                  'license_plate': {'bbox': [x1, y1, x2, y2],
-                                                                    'text': license_plate_text,
-                                                                    'bbox_score': score,
-                                                                    'text_score': license_plate_text_score}}
-
-# write results
-write_csv(results, './test.csv')
\ No newline at end of file
+from util_sl import PlateRow, get_car, ocr_worker, write_csv
+
+
+def add_results(results, frame_nmr, plates, texts):
+    # one row per car and frame; like the old per-frame dict, the last plate read for a car wins
+    rows = {}
+    for (car_id, car_bbox, license_plate_bbox, score), (license_plate_text, license_plate_text_score) in zip(plates, texts):
+        if license_plate_text is not None:
+            rows[car_id] = PlateRow(frame_nmr, car_id, tuple(car_bbox), tuple(license_plate_bbox), score,
+                                    license_plate_text, license_plate_text_score)
+    results.extend(rows.values())
+
+
+def ocr_failed(ocr_out, ocr_process):
+    # the OCR process exited while jobs were still being sent, so it failed: raise the
+    # error it reported, or its exit code if it died without one
+    try:
+        while True:
+            item = ocr_out.get(timeout=1)
+            if isinstance(item, Exception):
+                raise item
+    except queue.Empty:
+        pass
+    raise RuntimeError('OCR process exited with code {}'.format(ocr_process.exitcode))
+
+
+def ocr_put(ocr_in, ocr_out, ocr_process, job):
+    # wait while the input queue is full, but not on an OCR process that is gone
+    while True:
+        try:
+            ocr_in.put(job, timeout=1)
+            return
+        except queue.Full:
+            if not ocr_process.is_alive():
+                ocr_failed(ocr_out, ocr_process)
+
+
+def ocr_get(ocr_out, ocr_process, block=True):
+    # next message of the OCR process, None once it is done; raises if it failed
+    while True:
+        try:
+            item = ocr_out.get(timeout=1) if block else ocr_out.get_nowait()
+        except queue.Empty:
+            if ocr_process.is_alive():
+                if not block:
+                    raise
+                continue
+
+            # the process may have exited right after its last put, so read what it
+            # left behind; it always ends with None or an error, so an empty queue
+            # means it died
+            try:
+                item = ocr_out.get(timeout=1)
+            except queue.Empty:
+                raise RuntimeError('OCR process exited with code {}'.format(ocr_process.exitcode))
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def main():
+    results = []
+
+    mot_tracker = Sort()
+
+    # load models
+    coco_model = YOLO('yolov11n.pt')
+    license_plate_detector = YOLO('detection_model.pt')
+
+    # start the OCR process; spawn so it gets its own Paddle/CUDA context
+    ctx = multiprocessing.get_context('spawn')
+    ocr_in = ctx.Queue(maxsize=64)
+    ocr_out = ctx.Queue()
+    ocr_process = ctx.Process(target=ocr_worker, args=(ocr_in, ocr_out), daemon=True)
+    ocr_process.start()
+
+    # load video
+    cap = cv2.VideoCapture('./sample.mp4')
+
+    vehicles = [2, 3, 5, 7]
+
+    # read frames
+    frame_nmr = -1
+    ret = True
+    while ret:
+        frame_nmr += 1
+        ret, frame = cap.read()
+        if ret:
+            # detect vehicles
+            detections = coco_model(frame)[0]
+            detections_ = []
+            for detection in detections.boxes.data.tolist():
+                x1, y1, x2, y2, score, class_id = detection
+                if int(class_id) in vehicles:
+                    detections_.append([x1, y1, x2, y2, score])
+
+            # track vehicles
+            track_ids = mot_tracker.update(np.asarray(detections_))
+
+            # detect license plates
+            license_plates = license_plate_detector(frame)[0]
+            plates = []
+            license_plate_crops = []
+            for license_plate in license_plates.boxes.data.tolist():
+                x1, y1, x2, y2, score, class_id = license_plate
+
+                # assign license plate to car
+                xcar1, ycar1, xcar2, ycar2, car_id = get_car(license_plate, track_ids)
+
+                if car_id != -1:
+
+                    # crop license plate
+                    license_plate_crop = frame[int(y1):int(y2), int(x1): int(x2), :]
+
+                    # process license plate
+                    license_plate_crop_gray = cv2.cvtColor(license_plate_crop, cv2.COLOR_BGR2GRAY)
+                    _, license_plate_crop_thresh = cv2.threshold(license_plate_crop_gray, 64, 255, cv2.THRESH_BINARY_INV)
+
+                    plates.append((car_id, [xcar1, ycar1, xcar2, ycar2], [x1, y1, x2, y2], score))
+                    license_plate_crops.append(license_plate_crop_thresh)
+
+            # hand the frame's license plates to the OCR process
+            if license_plate_crops:
+                ocr_put(ocr_in, ocr_out, ocr_process, (frame_nmr, plates, license_plate_crops))
+
+            # collect whatever the OCR process has finished so far
+            while True:
+                try:
+                    add_results(results, *ocr_get(ocr_out, ocr_process, block=False))
+                except queue.Empty:
+                    break
+
+    # wait for the OCR process to read the remaining license plates
+    ocr_put(ocr_in, ocr_out, ocr_process, None)
+    for item in iter(lambda: ocr_get(ocr_out, ocr_process), None):
+        add_results(results, *item)
+    ocr_process.join()
+
+    # write results
+    write_csv(results, './test.csv')
+
+
+if __name__ == '__main__':
+    main()
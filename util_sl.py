@@ -1,67 +1,210 @@
+import csv
+import logging
+import os
 import string
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+import paddle
+from numba import njit
 from paddleocr import PaddleOCR
-import re
 
-# Initialize the PaddleOCR reader
-# use_gpu can be set to True if GPU is available
-ocr = PaddleOCR(use_angle_cls=True, lang="en", use_gpu=False)
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Run OCR on the GPU when Paddle was built with CUDA support and a GPU is present.
+# Set LPR_USE_GPU=0 to force CPU inference.
+use_gpu = (
+    os.environ.get("LPR_USE_GPU", "1") != "0"
+    and paddle.device.is_compiled_with_cuda()
+    and paddle.device.cuda.device_count() > 0
+)
+
+# Directory holding det.onnx, rec.onnx and cls.onnx written by export_onnx.py.
+# When set, the models run on ONNX Runtime instead of Paddle Inference.
+onnx_dir = os.environ.get("LPR_ONNX_DIR")
+
+# Overrides the recognizer model, e.g. an INT8 quantized one: a model directory
+# for Paddle Inference or an .onnx file together with LPR_ONNX_DIR.
+rec_model = os.environ.get("LPR_REC_MODEL")
+
+# Number of threads reading license plates concurrently in ocr_worker, each with its
+# own single-threaded reader. 0 reads every frame's plates in one batch instead,
+# which suits the GPU better. PaddleOCR ignores cpu_threads on ONNX Runtime, whose
+# sessions already use every core, so the thread pool is off by default there too.
+ocr_threads = int(
+    os.environ.get(
+        "LPR_OCR_THREADS",
+        0 if use_gpu or onnx_dir else min(8, os.cpu_count() or 1),
+    )
+)
+
+# PaddleOCR readers and resize buffers are not thread safe, so every thread gets
+# its own. Readers are created on first use, so processes that only track
+# vehicles or write results never load the OCR models.
+_local = threading.local()
+
+
+def get_ocr(cpu_threads=10):
+    """
+    Return the PaddleOCR reader of the calling thread, initializing and warming it up on the first call.
+
+    Args:
+        cpu_threads (int): Number of CPU threads the reader may use if it has to be created.
+
+    Returns:
+        PaddleOCR: The PaddleOCR reader of the calling thread.
+    """
+    ocr = getattr(_local, "ocr", None)
+    if ocr is None:
+        options = {}
+        if onnx_dir:
+            options = {
+                "use_onnx": True,
+                "det_model_dir": os.path.join(onnx_dir, "det.onnx"),
+                "rec_model_dir": os.path.join(onnx_dir, "rec.onnx"),
+                "cls_model_dir": os.path.join(onnx_dir, "cls.onnx"),
+            }
+        if rec_model:
+            options["rec_model_dir"] = rec_model
+            if not onnx_dir:
+                # Paddle Inference only runs INT8 kernels through oneDNN, which
+                # PaddleOCR leaves disabled unless asked
+                options["enable_mkldnn"] = True
+
+        ocr = _local.ocr = PaddleOCR(
+            use_angle_cls=True,
+            lang="en",
+            use_gpu=use_gpu,
+            gpu_mem=500,
+            cpu_threads=cpu_threads,
+            show_log=False,
+            **options,
+        )
+
+        # Warm up the classifier and recognizer so the first real frame does not
+        # pay the one-off kernel selection and memory allocation cost. Text
+        # detection is skipped as on the hot path; on a blank image it would find
+        # no boxes and return before the other two models ever ran.
+        ocr.ocr(np.zeros((48, 192, 3), dtype=np.uint8), det=False, cls=True)
+
+    return ocr
+
 
 # Mapping dictionaries for character conversion
 dict_char_to_int = {"O": "0", "I": "1", "J": "3", "A": "4", "G": "6", "S": "5"}
 dict_int_to_char = {"0": "O", "1": "I", "3": "J", "4": "A", "6": "G", "5": "S"}
 
+# Translation tables applying the mappings to the letter and number parts
+_LETTER_TABLE = str.maketrans(dict_int_to_char)
+_DIGIT_TABLE = str.maketrans(dict_char_to_int)
+
+# Characters accepted in the letter and number parts before the mappings are applied
+_VALID_LETTERS = frozenset(string.ascii_uppercase).union(dict_int_to_char)
+_VALID_DIGITS = frozenset(string.digits).union(dict_char_to_int)
+
+# Lookup tables indexed by byte value, 1 for accepted characters
+_IS_LETTER = bytes(chr(i) in _VALID_LETTERS for i in range(256))
+_IS_DIGIT = bytes(chr(i) in _VALID_DIGITS for i in range(256))
+
+# Columns of the results CSV
+CSV_HEADER = (
+    "frame_nmr",
+    "car_id",
+    "car_bbox",
+    "license_plate_bbox",
+    "license_plate_bbox_score",
+    "license_number",
+    "license_number_score",
+)
+
+# License plate grammar: letters followed by digits (KF-7617)
+PLATE_LETTERS = 2
+PLATE_DIGITS = 4
+
+# Recognition confidence above which no further detections are considered
+CONFIDENT_SCORE = 0.9
+
+# Input height and maximum width of the text recognizer
+REC_HEIGHT = 48
+REC_MAX_WIDTH = 320
+
+# Number of plate reads cached by crop hash
+PLATE_CACHE_SIZE = 1024
+
+# Successful plate reads keyed by (car_id, difference hash of the crop), least
+# recently used first; shared by the threads of ocr_worker. Entries are never
+# shared between tracked vehicles, since plates with the same layout on different
+# vehicles can hash alike.
+_plate_cache = OrderedDict()
+_plate_cache_lock = threading.Lock()
+
+# Translation table removing spaces and hyphens from detected text
+_STRIP = str.maketrans("", "", " -")
+
+
+@dataclass(slots=True)
+class PlateRow:
+    """
+    A detected license plate, one row of the results CSV.
+
+    Attributes:
+        frame_nmr (int): Frame number.
+        car_id (float): Track ID of the vehicle.
+        car_bbox (tuple): Vehicle coordinates (x1, y1, x2, y2).
+        license_plate_bbox (tuple): License plate coordinates (x1, y1, x2, y2).
+        license_plate_bbox_score (float): License plate detection confidence.
+        license_number (str): Formatted license plate text.
+        license_number_score (float): License plate text confidence.
+    """
+
+    frame_nmr: int
+    car_id: float
+    car_bbox: tuple
+    license_plate_bbox: tuple
+    license_plate_bbox_score: float
+    license_number: str
+    license_number_score: float
+
+
+def _format_bbox(bbox):
+    """
+    Serialize bounding box coordinates as "[x1 y1 x2 y2]".
+    """
+    return "[" + " ".join([str(float(v)) for v in bbox]) + "]"
+
 
 def write_csv(results, output_path):
     """
     Write the results to a CSV file.
 
     Args:
-        results (dict): Dictionary containing the results.
+        results (list): PlateRow for every license plate read.
         output_path (str): Path to the output CSV file.
     """
-    with open(output_path, "w") as f:
-        f.write(
-            "{},{},{},{},{},{},{}\n".format(
-                "frame_nmr",
-                "car_id",
-                "car_bbox",
-                "license_plate_bbox",
-                "license_plate_bbox_score",
-                "license_number",
-                "license_number_score",
+    with open(output_path, "w", buffering=1 << 20, newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        # Convert NumPy scalars so the CSV holds plain numbers rather than their repr
+        writer.writerows(
+            (
+                row.frame_nmr,
+                float(row.car_id),
+                _format_bbox(row.car_bbox),
+                _format_bbox(row.license_plate_bbox),
+                row.license_plate_bbox_score,
+                row.license_number,
+                row.license_number_score,
             )
+            for row in results
         )
 
-        for frame_nmr in results.keys():
-            for car_id in results[frame_nmr].keys():
-                print(results[frame_nmr][car_id])
-                if (
-                    "car" in results[frame_nmr][car_id].keys()
-                    and "license_plate" in results[frame_nmr][car_id].keys()
-                    and "text" in results[frame_nmr][car_id]["license_plate"].keys()
-                ):
-                    f.write(
-                        "{},{},{},{},{},{},{}\n".format(
-                            frame_nmr,
-                            car_id,
-                            "[{} {} {} {}]".format(
-                                results[frame_nmr][car_id]["car"]["bbox"][0],
-                                results[frame_nmr][car_id]["car"]["bbox"][1],
-                                results[frame_nmr][car_id]["car"]["bbox"][2],
-                                results[frame_nmr][car_id]["car"]["bbox"][3],
-                            ),
-                            "[{} {} {} {}]".format(
-                                results[frame_nmr][car_id]["license_plate"]["bbox"][0],
-                                results[frame_nmr][car_id]["license_plate"]["bbox"][1],
-                                results[frame_nmr][car_id]["license_plate"]["bbox"][2],
-                                results[frame_nmr][car_id]["license_plate"]["bbox"][3],
-                            ),
-                            results[frame_nmr][car_id]["license_plate"]["bbox_score"],
-                            results[frame_nmr][car_id]["license_plate"]["text"],
-                            results[frame_nmr][car_id]["license_plate"]["text_score"],
-                        )
-                    )
-        f.close()
+    logger.info("wrote %d rows to %s", len(results), output_path)
 
 
 def extract_plate_format(text):
@@ -77,67 +220,115 @@ def extract_plate_format(text):
         str: Extracted license plate text in the expected format or None if not found.
     """
     # Remove all spaces and special characters
-    text = text.upper().replace(" ", "").replace("-", "")
+    return _extract_plate_format_normalized(text.upper().translate(_STRIP))
 
-    # Try to match the pattern: 2 letters followed by 4 digits (KF7617)
-    import re
 
-    match = re.search(r"([A-Z]{2})(\d{4})", text)
-    if match:
-        letters = match.group(1)
-        digits = match.group(2)
-        return f"{letters}-{digits}"
+def _build_plate_scanner(num_letters, num_digits):
+    """
+    Generate a function that scans normalized text for num_letters upper case letters
+    followed by num_digits digits, with every character check unrolled.
+
+    Args:
+        num_letters (int): Number of letters of the plate.
+        num_digits (int): Number of digits of the plate.
 
+    Returns:
+        function: Function returning the first match formatted as LETTERS-DIGITS, or None.
+    """
+    length = num_letters + num_digits
+    letters = [f"c{k}" for k in range(num_letters)]
+    digits = [f"c{k}" for k in range(num_letters, length)]
+
+    source = f"""
+def scan(text):
+    for i in range(len(text) - {length - 1}):
+        {", ".join(letters)}, = text[i : i + {num_letters}]
+        if {" and ".join(f"'A' <= {c} <= 'Z'" for c in letters)}:
+            {", ".join(digits)}, = text[i + {num_letters} : i + {length}]
+            if {" and ".join(f"'0' <= {c} <= '9'" for c in digits)}:
+                return {" + ".join(letters)} + "-" + {" + ".join(digits)}
     return None
+"""
+    namespace = {}
+    exec(compile(source, "<plate scanner>", "exec"), namespace)
+    return namespace["scan"]
 
 
-def license_complies_format(text):
+# extract_plate_format() for text that is already upper case without spaces or
+# hyphens, specialized for the pattern: 2 letters followed by 4 digits (KF7617)
+_extract_plate_format_normalized = _build_plate_scanner(PLATE_LETTERS, PLATE_DIGITS)
+
+
+def _split_plate(text):
     """
-    Check if the license plate text complies with the required format (KF-7617).
-    The province code (NW) is ignored.
+    Split license plate text into its letter and number parts, dropping a province code.
 
     Args:
-        text (str): License plate text.
+        text (str): License plate text, upper case without spaces.
 
     Returns:
-        bool: True if the license plate complies with the format, False otherwise.
+        tuple: (letters, numbers), or None if the text has no recognizable structure.
     """
-    # Remove spaces and handle hyphen variations
-    text = text.upper().replace(" ", "")
-
-    # Pattern can be KF7617 or KF-7617
+    # Pattern can be KF-7617 or KF7617
     if "-" in text:
         parts = text.split("-")
-        if len(parts) == 2:
-            # Check if first part might contain province code (e.g. "NWKF")
-            if len(parts[0]) > 2:
-                # Try to extract the last two characters as the main letters
-                parts[0] = parts[0][-2:]
-            letters, numbers = parts[0], parts[1]
-        else:
-            return False
-    else:
-        # Try to extract the format without hyphen
-        # If text contains province code (e.g. "NWKF7617")
-        match = re.search(r"([A-Z]+)(\d{4})$", text)
-        if match:
-            letters = match.group(1)[-2:]  # Take last two letters
-            numbers = match.group(2)
-        else:
-            return False
+        if len(parts) != 2:
+            return None
 
+        # The first part might contain a province code (e.g. "NWKF"),
+        # so take its last two characters as the main letters
+        return parts[0][-2:], parts[1]
+
+    # Without hyphen: the last two letters in front of the trailing
+    # 4 digits, skipping a province code (e.g. "NWKF7617")
+    numbers = text[-4:]
+    if len(text) < 5 or not numbers.isdecimal() or not "A" <= text[-5] <= "Z":
+        return None
+    if len(text) >= 6 and "A" <= text[-6] <= "Z":
+        return text[-6:-4], numbers
+    return text[-5], numbers
+
+
+def _parts_comply(letters, numbers):
+    """
+    Check if the letter and number parts of a license plate form the format KF-7617.
+    """
     # Validate the format: 2 letters + 4 digits
-    if (
-        len(letters) == 2
-        and len(numbers) == 4
-        and all(
-            l in string.ascii_uppercase or l in dict_int_to_char.keys() for l in letters
-        )
-        and all(n in "0123456789" or n in dict_char_to_int.keys() for n in numbers)
-    ):
-        return True
+    if len(letters) != 2 or len(numbers) != 4:
+        return False
+
+    # Non-ASCII characters become "?", which neither table accepts
+    b = (letters + numbers).encode("ascii", "replace")
+    return bool(
+        _IS_LETTER[b[0]]
+        & _IS_LETTER[b[1]]
+        & _IS_DIGIT[b[2]]
+        & _IS_DIGIT[b[3]]
+        & _IS_DIGIT[b[4]]
+        & _IS_DIGIT[b[5]]
+    )
+
+
+def _format_parts(letters, numbers):
+    """
+    Join the letter and number parts of a license plate, converting misread characters.
+    """
+    return f"{letters.translate(_LETTER_TABLE)}-{numbers.translate(_DIGIT_TABLE)}"
 
-    return False
+
+def license_complies_format(text):
+    """
+    Check if the license plate text complies with the required format (KF-7617).
+    The province code (NW) is ignored.
+
+    Args:
+        text (str): License plate text.
+
+    Returns:
+        bool: True if the license plate complies with the format, False otherwise.
+    """
+    parts = _split_plate(text.upper().replace(" ", ""))
+    return parts is not None and _parts_comply(*parts)
 
 
 def format_license(text):
@@ -153,92 +344,71 @@ def format_license(text):
     """
     # Extract the main part of the license plate
     formatted_text = extract_plate_format(text)
-    if not formatted_text:
-        # If extraction failed, try to format the raw text
-        text = text.upper().replace(" ", "")
-
-        # If text contains a hyphen, split it
-        if "-" in text:
-            parts = text.split("-")
-            if len(parts) == 2:
-                if len(parts[0]) > 2:
-                    # Take the last two characters as main letters
-                    letters = parts[0][-2:]
-                else:
-                    letters = parts[0]
-                numbers = parts[1]
-            else:
-                return text  # Return original if format is unclear
-        else:
-            # Try to extract without hyphen
-            match = re.search(r"([A-Z]+)(\d{4})$", text)
-            if match:
-                letters = match.group(1)[-2:]  # Take last two letters
-                numbers = match.group(2)
-            else:
-                return text  # Return original if format is unclear
+    if formatted_text:
+        return formatted_text
 
-        # Format letter part (first two characters)
-        formatted_letters = ""
-        for char in letters:
-            if char in dict_char_to_int.keys():
-                formatted_letters += dict_int_to_char[dict_char_to_int[char]]
-            else:
-                formatted_letters += char
-
-        # Format number part (last four characters)
-        formatted_numbers = ""
-        for char in numbers:
-            if char in dict_int_to_char.keys():
-                formatted_numbers += dict_char_to_int[char]
-            elif char in dict_char_to_int.keys():
-                formatted_numbers += dict_char_to_int[char]
-            else:
-                formatted_numbers += char
-
-        formatted_text = f"{formatted_letters}-{formatted_numbers}"
+    # If extraction failed, try to format the raw text
+    text = text.upper().replace(" ", "")
+    parts = _split_plate(text)
+    if parts is None:
+        return text  # Return original if format is unclear
 
-    return formatted_text
+    return _format_parts(*parts)
 
 
-def read_license_plate(license_plate_crop):
+def select_license_plate(detections):
     """
-    Read the license plate text from the given cropped image.
-    Optimized for KF-7617 format plates, ignoring province codes.
+    Pick the license plate text out of a sequence of OCR recognitions.
 
     Args:
-        license_plate_crop (numpy.ndarray): Cropped image containing the license plate.
+        detections (iterable): (text, confidence) pairs returned by the recognizer.
 
     Returns:
         tuple: Tuple containing the formatted license plate text and its confidence score.
     """
-    # PaddleOCR returns a list of tuples: [([[x1,y1],[x2,y2],[x3,y3],[x4,y4]], (text, confidence))]
-    result = ocr.ocr(license_plate_crop, cls=True)
+    return _select_license_plate_normalized(_normalize_detections(detections))
 
-    # Check if result is empty or None
-    if not result or not result[0]:
-        return None, None
 
-    best_text = None
-    best_score = 0
+def _normalize_detections(detections):
+    """
+    Upper-case OCR texts and remove their spaces in a single pass.
+
+    Args:
+        detections (iterable): (text, confidence) pairs returned by the recognizer.
 
-    for detection in result[0]:
-        _, (text, score) = detection
+    Returns:
+        list: (normalized text, confidence) pairs.
+    """
+    return [(text.upper().replace(" ", ""), score) for text, score in detections]
 
-        # Process the text
-        text = text.upper()
 
+def _select_license_plate_normalized(detections):
+    """
+    select_license_plate() for detections normalized by _normalize_detections().
+    """
+    best_text = None
+    best_score = 0
+
+    # Try the most confident detections first
+    for text, score in sorted(detections, key=lambda detection: detection[1], reverse=True):
         # Extract the main part of the license plate if possible
-        extracted_plate = extract_plate_format(text)
+        extracted_plate = _extract_plate_format_normalized(text.replace("-", ""))
         if extracted_plate:
             return extracted_plate, score
 
-        # Check if the raw text might match our format
-        if license_complies_format(text):
-            formatted_text = format_license(text)
-            if score > best_score:
-                best_text = formatted_text
-                best_score = score
+        # Check if the raw text might match our format; being sorted, the
+        # first match is the most confident one
+        if best_text is None and score > best_score:
+            parts = _split_plate(text)
+            if parts is None or not _parts_comply(*parts):
+                continue
+
+            best_text = _format_parts(*parts)
+            best_score = score
+
+            # Stop early on a confident read
+            if score >= CONFIDENT_SCORE:
+                break
 
     if best_text:
         return best_text, best_score
@@ -246,29 +416,285 @@ def read_license_plate(license_plate_crop):
     return None, None
 
 
+def _resize_for_recognizer(license_plate_crop):
+    """
+    Resize a license plate crop to the recognizer input height, keeping its aspect ratio.
+    The result is a view into a buffer of the calling thread and is only valid until its next call.
+
+    Args:
+        license_plate_crop (numpy.ndarray): Grayscale or BGR image of the license plate.
+
+    Returns:
+        numpy.ndarray: BGR image of shape (REC_HEIGHT, width, 3), or the crop itself
+            if it is too wide for the buffer.
+    """
+    h, w = license_plate_crop.shape[:2]
+    width = max(1, round(w * REC_HEIGHT / max(h, 1)))
+
+    # Squashing wider crops into the buffer would distort the characters; the
+    # recognizer widens its input for them instead, so pass them through as they are
+    if width > REC_MAX_WIDTH:
+        return license_plate_crop
+
+    # Buffers reused across calls, allocated once per thread
+    buffers = getattr(_local, "rec_buffers", None)
+    if buffers is None:
+        buffers = _local.rec_buffers = (
+            np.empty(REC_HEIGHT * REC_MAX_WIDTH * 3, dtype=np.uint8),
+            np.empty(REC_HEIGHT * REC_MAX_WIDTH, dtype=np.uint8),
+        )
+    rec_buf, rec_gray_buf = buffers
+
+    # Contiguous views of the flat buffers, so OpenCV writes into them in place
+    resized = rec_buf[: REC_HEIGHT * width * 3].reshape(REC_HEIGHT, width, 3)
+    if license_plate_crop.ndim == 2:
+        gray = rec_gray_buf[: REC_HEIGHT * width].reshape(REC_HEIGHT, width)
+        cv2.resize(license_plate_crop, (width, REC_HEIGHT), dst=gray)
+        cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=resized)
+    else:
+        cv2.resize(license_plate_crop, (width, REC_HEIGHT), dst=resized)
+
+    return resized
+
+
+def _dhash64(license_plate_crop):
+    """
+    Compute the 64-bit difference hash of an image. Near-identical crops of the
+    same plate in consecutive frames get the same hash.
+
+    Args:
+        license_plate_crop (numpy.ndarray): Grayscale or BGR image of the license plate.
+
+    Returns:
+        int: One bit per horizontally adjacent pixel pair of a 9x8 grayscale thumbnail.
+    """
+    gray = license_plate_crop
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
+
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _cache_key(license_plate_crop, car_id):
+    """
+    Return the cache key of a crop of the given vehicle's plate, or None without a vehicle.
+    """
+    if car_id is None:
+        return None
+    return float(car_id), _dhash64(license_plate_crop)
+
+
+def _cache_get(key):
+    """
+    Return the cached plate read for a cache key, or None.
+    """
+    if key is None:
+        return None
+
+    with _plate_cache_lock:
+        plate = _plate_cache.get(key)
+        if plate is not None:
+            _plate_cache.move_to_end(key)
+        return plate
+
+
+def _cache_put(key, plate):
+    """
+    Cache a successful plate read, evicting the least recently used entry when full.
+    Failed reads are not cached, so the next frame tries again.
+    """
+    if key is None or plate[0] is None:
+        return
+
+    with _plate_cache_lock:
+        _plate_cache[key] = plate
+        _plate_cache.move_to_end(key)
+        if len(_plate_cache) > PLATE_CACHE_SIZE:
+            _plate_cache.popitem(last=False)
+
+
+def read_license_plate(license_plate_crop, car_id=None):
+    """
+    Read the license plate text from the given cropped image.
+    Optimized for KF-7617 format plates, ignoring province codes.
+
+    Args:
+        license_plate_crop (numpy.ndarray): Cropped image containing the license plate.
+        car_id (float): Track ID of the vehicle carrying the plate; enables reusing
+            earlier reads of near-identical crops of the same vehicle.
+
+    Returns:
+        tuple: Tuple containing the formatted license plate text and its confidence score.
+    """
+    # Reuse the read of a near-identical crop of the same vehicle, e.g. a stationary one
+    key = _cache_key(license_plate_crop, car_id)
+    plate = _cache_get(key)
+    if plate is not None:
+        return plate
+
+    # The crop is already tight around the plate, so skip text detection.
+    # PaddleOCR then returns a list of tuples: [[(text, confidence)]]
+    result = get_ocr().ocr(_resize_for_recognizer(license_plate_crop), det=False, cls=True)
+
+    # Check if result is empty or None
+    if not result or not result[0]:
+        plate = None, None
+    else:
+        plate = select_license_plate(result[0])
+
+    _cache_put(key, plate)
+    return plate
+
+
+def read_license_plates_batch(license_plate_crops, car_ids=None):
+    """
+    Read the license plate text from several cropped images in one recognizer call.
+    The crops are already tight around the plate, so text detection is skipped and
+    the crops go straight to the angle classifier and recognizer as a single batch.
+
+    Args:
+        license_plate_crops (list): Cropped images (numpy.ndarray) containing the license plates.
+        car_ids (list): Track IDs of the vehicles carrying the plates, one per crop;
+            enables reusing earlier reads of near-identical crops of the same vehicle.
+
+    Returns:
+        list: (text, confidence score) tuples, one per crop, (None, None) where no plate was read.
+    """
+    if car_ids is None:
+        car_ids = [None] * len(license_plate_crops)
+
+    # Reuse the reads of near-identical crops of the same vehicles and only run OCR on the rest
+    keys = [_cache_key(crop, car_id) for crop, car_id in zip(license_plate_crops, car_ids)]
+    plates = [_cache_get(key) for key in keys]
+    missing = [i for i, plate in enumerate(plates) if plate is None]
+    if not missing:
+        return plates
+
+    # The recognizer expects 3-channel images; it resizes every crop to its
+    # input height and pads the batch to a common width itself
+    crops = [
+        cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR) if crop.ndim == 2 else crop
+        for crop in (license_plate_crops[i] for i in missing)
+    ]
+
+    # Wrapping the crops in an outer list makes PaddleOCR treat them as one batch
+    # and returns [[(text, confidence), ...]] with one entry per crop. This relies
+    # on PaddleOCR 2.7 unpacking list inputs as pages; 2.8+ only does so for PDFs
+    # and would hand the classifier a list, hence the pin in requirements.txt.
+    result = get_ocr().ocr([crops], det=False, cls=True)
+
+    if not result or not result[0]:
+        texts = [(None, None)] * len(crops)
+    else:
+        # Normalize the texts of the whole batch at once, then pick the plate
+        # of every crop from its single recognition
+        texts = [
+            _select_license_plate_normalized([detection])
+            for detection in _normalize_detections(result[0])
+        ]
+
+    for i, plate in zip(missing, texts):
+        plates[i] = plate
+        _cache_put(keys[i], plate)
+
+    return plates
+
+
+@njit(cache=True, nogil=True)
+def _find_car(x1, y1, x2, y2, vehicle_track_ids):
+    """
+    Return the index of the first vehicle whose bounding box contains the license plate, or -1.
+    """
+    for j in range(vehicle_track_ids.shape[0]):
+        if (
+            x1 > vehicle_track_ids[j, 0]
+            and y1 > vehicle_track_ids[j, 1]
+            and x2 < vehicle_track_ids[j, 2]
+            and y2 < vehicle_track_ids[j, 3]
+        ):
+            return j
+
+    return -1
+
+
 def get_car(license_plate, vehicle_track_ids):
     """
     Retrieve the vehicle coordinates and ID based on the license plate coordinates.
 
     Args:
         license_plate (tuple): Tuple containing the coordinates of the license plate (x1, y1, x2, y2, score, class_id).
-        vehicle_track_ids (list): List of vehicle track IDs and their corresponding coordinates.
+        vehicle_track_ids (numpy.ndarray): Array of shape (N, 5) with the vehicle coordinates and track IDs.
 
     Returns:
         tuple: Tuple containing the vehicle coordinates (x1, y1, x2, y2) and ID.
     """
     x1, y1, x2, y2, score, class_id = license_plate
 
-    foundIt = False
-    for j in range(len(vehicle_track_ids)):
-        xcar1, ycar1, xcar2, ycar2, car_id = vehicle_track_ids[j]
-
-        if x1 > xcar1 and y1 > ycar1 and x2 < xcar2 and y2 < ycar2:
-            car_indx = j
-            foundIt = True
-            break
+    vehicle_track_ids = np.asarray(vehicle_track_ids, dtype=np.float64).reshape(-1, 5)
 
-    if foundIt:
+    car_indx = _find_car(x1, y1, x2, y2, vehicle_track_ids)
+    if car_indx != -1:
         return vehicle_track_ids[car_indx]
 
     return -1, -1, -1, -1, -1
+
+
+def read_license_plates_parallel(license_plate_crops, executor, car_ids=None):
+    """
+    Read the license plate text from several cropped images concurrently.
+    PaddleOCR releases the GIL during inference, so the reads scale across cores.
+
+    Args:
+        license_plate_crops (list): Cropped images (numpy.ndarray) containing the license plates.
+        executor (concurrent.futures.ThreadPoolExecutor): Pool whose threads run read_license_plate.
+        car_ids (list): Track IDs of the vehicles carrying the plates, one per crop.
+
+    Returns:
+        list: (text, confidence score) tuples, one per crop, (None, None) where no plate was read.
+    """
+    if car_ids is None:
+        car_ids = [None] * len(license_plate_crops)
+
+    return list(executor.map(read_license_plate, license_plate_crops, car_ids))
+
+
+def ocr_worker(in_queue, out_queue):
+    """
+    Read license plates in a separate process so OCR runs concurrently with
+    vehicle detection and tracking.
+
+    Args:
+        in_queue (multiprocessing.Queue): (frame_nmr, plates, license_plate_crops) jobs, None to stop.
+        out_queue (multiprocessing.Queue): Receives (frame_nmr, plates, texts) for every job,
+            followed by None once the worker stops, or a RuntimeError if it fails.
+    """
+    try:
+        executor = None
+        if ocr_threads > 0:
+            # One single-threaded reader per pool thread, so the threads do not
+            # oversubscribe the cores
+            executor = ThreadPoolExecutor(
+                max_workers=ocr_threads, initializer=get_ocr, initargs=(1,)
+            )
+        else:
+            get_ocr()
+
+        for frame_nmr, plates, license_plate_crops in iter(in_queue.get, None):
+            car_ids = [car_id for car_id, *_ in plates]
+            if executor is not None:
+                texts = read_license_plates_parallel(license_plate_crops, executor, car_ids)
+            else:
+                texts = read_license_plates_batch(license_plate_crops, car_ids)
+            out_queue.put((frame_nmr, plates, texts))
+
+        if executor is not None:
+            executor.shutdown()
+    except Exception:
+        # Report the failure to the parent instead of leaving it waiting; the
+        # traceback is sent as text since not every exception can be pickled
+        out_queue.put(RuntimeError("OCR worker failed:\n" + traceback.format_exc()))
+        return
+
+    out_queue.put(None)